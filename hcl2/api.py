@@ -1,8 +1,8 @@
 """The API that will be exposed to users of this package"""
-from typing import TextIO
+from typing import TextIO, cast
 
 from lark.tree import Tree as AST
-from hcl2.parser import parser
+from hcl2.parser import parser, transforming_parser
 from hcl2.transformer import DictTransformer
 
 
@@ -25,6 +25,8 @@ def loads(text: str, with_meta=False) -> dict:
     # Lark doesn't support a EOF token so our grammar can't look for "new line or end of file"
     # This means that all blocks must end in a new line even if the file ends
     # Append a new line as a temporary fix
+    if not with_meta:
+        return cast(dict, transforming_parser(DictTransformer).parse(text + "\n"))
     tree = parser().parse(text + "\n")
     return DictTransformer(with_meta=with_meta).transform(tree)
 
@@ -1,11 +1,16 @@
 """A parser for HCL2 implemented using the Lark parser"""
 import functools
 from pathlib import Path
+from typing import Any, Type
 
-from lark import Lark
+from lark import Lark, Transformer
+from lark.exceptions import GrammarError, VisitError
 
 
 PARSER_FILE = Path(__file__).absolute().resolve().parent / ".lark_cache.bin"
+TRANSFORMING_PARSER_FILE = (
+    Path(__file__).absolute().resolve().parent / ".lark_transforming_cache.bin"
+)
 
 
 @functools.lru_cache()
@@ -20,6 +25,51 @@ def parser() -> Lark:
     )
 
 
+@functools.lru_cache()
+def transforming_parser(transformer_class: Type[Transformer]) -> Lark:
+    """
+    Build parser for transforming HCL2 text directly into python structures.
+    The transformer callbacks are applied while parsing, so no parse tree is built
+    in between. Lark doesn't support passing `meta` to such callbacks, use `parser`
+    and transform the resulting tree when it's needed.
+    """
+    return Lark.open(
+        "hcl2.lark",
+        parser="lalr",
+        cache=str(TRANSFORMING_PARSER_FILE),
+        rel_to=__file__,
+        transformer=VisitErrorTransformer(transformer_class()),
+    )
+
+
+class VisitErrorTransformer:
+    """
+    Wraps a transformer embedded into the parser, so that errors raised by its callbacks
+    are reported as `VisitError`, the same way as by `Transformer.transform`.
+    Lark itself passes these errors through as they are.
+    """
+
+    def __init__(self, transformer: Transformer):
+        self.transformer = transformer
+
+    def __getattr__(self, name: str) -> Any:
+        callback = getattr(self.transformer, name)
+        # callbacks decorated with `v_args` are handled (or rejected) by lark itself
+        if not callable(callback) or hasattr(callback, "visit_wrapper"):
+            return callback
+
+        @functools.wraps(callback)
+        def wrapper(*args: Any) -> Any:
+            try:
+                return callback(*args)
+            except GrammarError:
+                raise
+            except Exception as exc:
+                raise VisitError(name, args, exc) from exc
+
+        return wrapper
+
+
 @functools.lru_cache()
 def reconstruction_parser() -> Lark:
     """
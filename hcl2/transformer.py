@@ -1,29 +1,62 @@
 """A Lark Transformer for transforming a Lark parse tree into a Python dict"""
 import json
 import re
-import sys
-from collections import namedtuple
-from typing import List, Dict, Any
+from inspect import getattr_static
+from typing import List, Dict, Any, Tuple, Iterator
 
 from lark.tree import Meta
-from lark.visitors import Transformer, Discard, _DiscardType, v_args
+from lark.visitors import Transformer_NonRecursive, v_args
 
 from .reconstructor import reverse_quotes_within_interpolation
 
 
-HEREDOC_PATTERN = re.compile(r"<<([a-zA-Z][a-zA-Z0-9._-]+)\n([\s\S]*)\1", re.S)
-HEREDOC_TRIM_PATTERN = re.compile(r"<<-([a-zA-Z][a-zA-Z0-9._-]+)\n([\s\S]*)\1", re.S)
+# matches both `<<` and `<<-` heredocs, group 1 is "-" for the trimmed version
+HEREDOC_PATTERN = re.compile(r"<<(-?)([a-zA-Z][\w.-]+)\n([\s\S]*)\2")
+match_heredoc = HEREDOC_PATTERN.match
+HEREDOC_TRIM_CHARS = "\n\t "
+
+
+LITERAL_KEYWORDS = {"true": True, "false": False, "null": None}
+
+# Returned for new lines and comments, which are then removed by `strip_new_line_tokens`.
+# Lark's `Discard` can't be used for that, as `Transformer_NonRecursive` loses track of
+# its stack of results when a rule is discarded.
+NEW_LINE = "\n"
 
 
 START_LINE = "__start_line__"
 END_LINE = "__end_line__"
 
 
-Attribute = namedtuple("Attribute", ("key", "value"))
+class Attribute:
+    """A single `key = value` attribute of a body, as returned by `DictTransformer.attribute`"""
+
+    __slots__ = ("key", "value")
+
+    def __init__(self, key: str, value: Any):
+        self.key = key
+        self.value = value
+
+    # keep behaving like the `namedtuple` this class used to be
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.key, self.value))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Attribute):
+            return self.key == other.key and self.value == other.value
+        if isinstance(other, tuple):
+            return (self.key, self.value) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.key, self.value))
+
+    def __repr__(self) -> str:
+        return f"Attribute(key={self.key!r}, value={self.value!r})"
 
 
 # pylint: disable=missing-function-docstring,unused-argument
-class DictTransformer(Transformer):
+class DictTransformer(Transformer_NonRecursive):
     """Takes a syntax tree generated by the parser and
     transforms it to a dict.
     """
@@ -41,29 +74,35 @@ class DictTransformer(Transformer):
         """
         self.with_meta = with_meta
         super().__init__()
+        # `meta` is only needed to add line numbers to blocks. Lark can't pass it to
+        # the callbacks of a transformer embedded into the parser (see
+        # `hcl2.parser.transforming_parser`) and wraps every call that takes it,
+        # so use a variant of `block` without it when it's unused, unless `block`
+        # is overridden by a subclass.
+        block = getattr_static(type(self), "block")
+        if not with_meta and block is vars(DictTransformer)["block"]:
+            self.block = self._block_no_meta
 
     def float_lit(self, args: List) -> float:
-        return float("".join([self.to_tf_inline(arg) for arg in args]))
+        return float("".join(map(self.to_tf_inline, args)))
 
     def int_lit(self, args: List) -> int:
-        return int("".join([self.to_tf_inline(arg) for arg in args]))
+        return int("".join(map(self.to_tf_inline, args)))
 
     def expr_term(self, args: List) -> Any:
         args = self.strip_new_line_tokens(args)
+        value = args[0]
 
-        #
-        if args[0] == "true":
-            return True
-        if args[0] == "false":
-            return False
-        if args[0] == "null":
-            return None
+        # keywords come from `identifier`, which always returns a plain str, so lark
+        # tokens and unhashable values like dicts and lists don't need to be looked up
+        if value.__class__ is str and value in LITERAL_KEYWORDS:
+            return LITERAL_KEYWORDS[value]
 
         # if the expression starts with a paren then unwrap it
-        if args[0] == "(":
+        if value == "(":
             return args[1]
         # otherwise return the value itself
-        return args[0]
+        return value
 
     def index_expr_term(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
@@ -77,84 +116,77 @@ class DictTransformer(Transformer):
         return f"{args[0]}{args[1]}"
 
     def get_attr(self, args: List) -> str:
-        return f".{args[0]}"
+        return "." + args[0]
 
     def attr_splat_expr_term(self, args: List) -> str:
         return f"{args[0]}{args[1]}"
 
     def attr_splat(self, args: List) -> str:
-        args_str = "".join(self.to_tf_inline(arg) for arg in args)
-        return f".*{args_str}"
+        # args are the already stringified `get_attr` results
+        return ".*" + "".join(args)
 
     def full_splat_expr_term(self, args: List) -> str:
         return f"{args[0]}{args[1]}"
 
     def full_splat(self, args: List) -> str:
-        args_str = "".join(self.to_tf_inline(arg) for arg in args)
-        return f"[*]{args_str}"
+        # args are the already stringified `get_attr` and `index` results
+        return "[*]" + "".join(args)
 
     def tuple(self, args: List) -> List:
-        return [self.to_string_dollar(arg) for arg in self.strip_new_line_tokens(args)]
+        return list(map(self.to_string_dollar, self.strip_new_line_tokens(args)))
 
-    def object_elem(self, args: List) -> Dict:
-        # This returns a dict with a single key/value pair to make it easier to merge these
-        # into a bigger dict that is returned by the "object" function
+    def object_elem(self, args: List) -> Tuple[Any, Any]:
+        # This returns a single key/value pair, so that the "object" function can build
+        # the whole dict at once
         key = self.strip_quotes(args[0])
         if len(args) == 3:
             value = self.to_string_dollar(args[2])
         else:
             value = self.to_string_dollar(args[1])
 
-        return {key: value}
+        return key, value
 
     def object(self, args: List) -> Dict:
-        args = self.strip_new_line_tokens(args)
-        result: Dict[str, Any] = {}
-        for arg in args:
-            result.update(arg)
-        return result
+        return dict(self.strip_new_line_tokens(args))
 
     def function_call(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
         args_str = ""
         if len(args) > 1:
-            args_str = ", ".join(
-                [self.to_tf_inline(arg) for arg in args[1] if arg is not Discard]
-            )
+            args_str = ", ".join(map(self.to_tf_inline, args[1]))
         return f"{args[0]}({args_str})"
 
     def provider_function_call(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
         args_str = ""
         if len(args) > 5:
-            args_str = ", ".join(
-                [self.to_tf_inline(arg) for arg in args[5] if arg is not Discard]
-            )
+            args_str = ", ".join(map(self.to_tf_inline, args[5]))
         provider_func = "::".join([args[0], args[2], args[4]])
         return f"{provider_func}({args_str})"
 
     def arguments(self, args: List) -> List:
-        return args
+        return self.strip_new_line_tokens(args)
 
-    def new_line_and_or_comma(self, args: List) -> _DiscardType:
-        return Discard
+    @staticmethod
+    def new_line_and_or_comma(args: List) -> str:
+        return NEW_LINE
 
     @v_args(meta=True)
-    def block(self, meta: Meta, args: List) -> Dict:
-        *block_labels, block_body = args
-        result: Dict[str, Any] = block_body
+    def block(self, meta: Meta, args: List) -> Dict:  # pylint: disable=method-hidden
         if self.with_meta:
-            result.update(
-                {
-                    START_LINE: meta.line,
-                    END_LINE: meta.end_line,
-                }
-            )
+            block_body = args[-1]
+            block_body[START_LINE] = meta.line
+            block_body[END_LINE] = meta.end_line
+        return self._block_no_meta(args)
+
+    def _block_no_meta(self, args: List) -> Dict:
+        block_labels = self.strip_new_line_tokens(args)
+        result: Dict[str, Any] = block_labels.pop()
 
         # create nested dict. i.e. {label1: {label2: {labelN: result}}}
+        strip_quotes = self.strip_quotes
         for label in reversed(block_labels):
-            label_str = self.strip_quotes(label)
-            result = {label_str: result}
+            result = {strip_quotes(label): result}
 
         return result
 
@@ -170,14 +202,17 @@ class DictTransformer(Transformer):
         return f"{args[0]} ? {args[1]} : {args[2]}"
 
     def binary_op(self, args: List) -> str:
-        return " ".join([self.to_tf_inline(arg) for arg in args])
+        # the left operand and the already stringified `binary_term`
+        left, term = self.strip_new_line_tokens(args)
+        return f"{self.to_tf_inline(left)} {term}"
 
     def unary_op(self, args: List) -> str:
-        return "".join([self.to_tf_inline(arg) for arg in args])
+        return "".join(map(self.to_tf_inline, args))
 
     def binary_term(self, args: List) -> str:
-        args = self.strip_new_line_tokens(args)
-        return " ".join([self.to_tf_inline(arg) for arg in args])
+        # the already stringified `binary_operator` and the right operand
+        operator, right = self.strip_new_line_tokens(args)
+        return f"{operator} {self.to_tf_inline(right)}"
 
     def body(self, args: List) -> Dict[str, List]:
         # See https://github.com/hashicorp/hcl/blob/main/hclsyntax/spec.md#bodies
@@ -197,25 +232,45 @@ class DictTransformer(Transformer):
         # labels. This means that all blocks (even when there is only one)
         # should be transformed into lists of blocks.
         args = self.strip_new_line_tokens(args)
+
+        # Many bodies only contain attributes, which can be added without keeping track
+        # of which keys are attributes and which are blocks.
+        # Nothing subclasses Attribute, so skip the isinstance() MRO walk.
+        for arg in args:
+            if arg.__class__ is not Attribute:
+                break
+        else:
+            return self._attributes_body(args)
+
         attributes = set()
         result: Dict[str, Any] = {}
         for arg in args:
-            if isinstance(arg, Attribute):
+            if arg.__class__ is Attribute:
                 if arg.key in result:
                     raise RuntimeError(f"{arg.key} already defined")
                 result[arg.key] = arg.value
                 attributes.add(arg.key)
             else:
-                # This is a block.
+                # This is a block. Its key is already a string, see `block`.
                 for key, value in arg.items():
-                    key = str(key)
-                    if key in result:
-                        if key in attributes:
-                            raise RuntimeError(f"{key} already defined")
-                        result[key].append(value)
-                    else:
+                    if key in attributes:
+                        raise RuntimeError(f"{key} already defined")
+                    # anything else stored under this key is a list of blocks
+                    blocks = result.get(key)
+                    if blocks is None:
                         result[key] = [value]
+                    else:
+                        blocks.append(value)
+
+        return result
 
+    @staticmethod
+    def _attributes_body(args: List[Attribute]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for arg in args:
+            if arg.key in result:
+                raise RuntimeError(f"{arg.key} already defined")
+            result[arg.key] = arg.value
         return result
 
     def start(self, args: List) -> Dict:
@@ -226,56 +281,62 @@ class DictTransformer(Transformer):
         return str(args[0])
 
     def heredoc_template(self, args: List) -> str:
-        match = HEREDOC_PATTERN.match(str(args[0]))
-        if not match:
+        match = match_heredoc(str(args[0]))
+        if not match or match.group(1) == "-":
             raise RuntimeError(f"Invalid Heredoc token: {args[0]}")
 
-        trim_chars = "\n\t "
-        return f'"{match.group(2).rstrip(trim_chars)}"'
+        return f'"{match.group(3).rstrip(HEREDOC_TRIM_CHARS)}"'
 
     def heredoc_template_trim(self, args: List) -> str:
         # See https://github.com/hashicorp/hcl2/blob/master/hcl/hclsyntax/spec.md#template-expressions
         # This is a special version of heredocs that are declared with "<<-"
         # This will calculate the minimum number of leading spaces in each line of a heredoc
         # and then remove that number of spaces from each line
-        match = HEREDOC_TRIM_PATTERN.match(str(args[0]))
-        if not match:
+        match = match_heredoc(str(args[0]))
+        if not match or match.group(1) != "-":
             raise RuntimeError(f"Invalid Heredoc token: {args[0]}")
 
-        trim_chars = "\n\t "
-        text = match.group(2).rstrip(trim_chars)
+        text = match.group(3).rstrip(HEREDOC_TRIM_CHARS)
         lines = text.split("\n")
 
-        # calculate the min number of leading spaces in each line
-        min_spaces = sys.maxsize
+        # calculate the min number of leading spaces in each line, ignoring empty lines,
+        # there is nothing to trim as soon as a line without leading spaces is found
+        min_spaces = None
         for line in lines:
-            leading_spaces = len(line) - len(line.lstrip(" "))
-            min_spaces = min(min_spaces, leading_spaces)
+            if line:
+                leading_spaces = len(line) - len(line.lstrip(" "))
+                if min_spaces is None or leading_spaces < min_spaces:
+                    min_spaces = leading_spaces
+                    if not min_spaces:
+                        break
+        if not min_spaces:
+            return f'"{text}"'
 
         # trim off that number of leading spaces from each line
         lines = [line[min_spaces:] for line in lines]
 
         return '"%s"' % "\n".join(lines)
 
-    def new_line_or_comment(self, args: List) -> _DiscardType:
-        return Discard
+    @staticmethod
+    def new_line_or_comment(args: List) -> str:
+        return NEW_LINE
 
     def for_tuple_expr(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
-        for_expr = " ".join([self.to_tf_inline(arg) for arg in args[1:-1]])
+        for_expr = " ".join(map(self.to_tf_inline, args[1:-1]))
         return f"[{for_expr}]"
 
     def for_intro(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
-        return " ".join([self.to_tf_inline(arg) for arg in args])
+        return " ".join(map(self.to_tf_inline, args))
 
     def for_cond(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
-        return " ".join([self.to_tf_inline(arg) for arg in args])
+        return " ".join(map(self.to_tf_inline, args))
 
     def for_object_expr(self, args: List) -> str:
         args = self.strip_new_line_tokens(args)
-        for_expr = " ".join([self.to_tf_inline(arg) for arg in args[1:-1]])
+        for_expr = " ".join(map(self.to_tf_inline, args[1:-1]))
         # doubled curly braces stands for inlining the braces
         # and the third pair of braces is for the interpolation
         # e.g. f"{2 + 2} {{2 + 2}}" == "4 {2 + 2}"
@@ -290,21 +351,22 @@ class DictTransformer(Transformer):
 
     def strip_new_line_tokens(self, args: List) -> List:
         """
-        Remove new line and Discard tokens.
+        Remove new line tokens.
         The parser will sometimes include these in the tree so we need to strip them out here
         """
-        return [arg for arg in args if arg != "\n" and arg is not Discard]
+        return [arg for arg in args if arg != NEW_LINE]
 
     def to_string_dollar(self, value: Any) -> Any:
         """Wrap a string in ${ and }"""
         if isinstance(value, str):
             # if it's already wrapped, pass it unmodified
-            if value.startswith("${") and value.endswith("}"):
+            if value[:2] == "${" and value[-1:] == "}":
                 return value
 
-            if value.startswith('"') and value.endswith('"'):
-                value = str(value)[1:-1]
-                return self.process_escape_sequences(value)
+            # indexing is noticeably cheaper than startswith/endswith method calls,
+            # slicing also turns lark tokens into plain strings
+            if value and value[0] == '"' and value[-1] == '"':
+                return self.process_escape_sequences(value[1:-1])
 
             if self.is_type_keyword(value):
                 return value
@@ -314,10 +376,8 @@ class DictTransformer(Transformer):
 
     def strip_quotes(self, value: Any) -> Any:
         """Remove quote characters from the start and end of a string"""
-        if isinstance(value, str):
-            if value.startswith('"') and value.endswith('"'):
-                value = str(value)[1:-1]
-                return self.process_escape_sequences(value)
+        if isinstance(value, str) and value and value[0] == '"' and value[-1] == '"':
+            return self.process_escape_sequences(value[1:-1])
         return value
 
     def process_escape_sequences(self, value: str) -> str:
@@ -343,7 +403,7 @@ class DictTransformer(Transformer):
             dict_v = json.dumps(value)
             return reverse_quotes_within_interpolation(dict_v)
         if isinstance(value, list):
-            value = [self.to_tf_inline(item) for item in value]
+            value = list(map(self.to_tf_inline, value))
             return f"[{', '.join(value)}]"
         if isinstance(value, bool):
             return "true" if value else "false"
@@ -0,0 +1,69 @@
+"""
+Optional build step for python-hcl2.
+
+All package metadata lives in pyproject.toml. This script only adds an optional
+Cython build of `hcl2/transformer.py`: the DictTransformer callbacks are invoked
+for every node of the parse tree, so compiling the module ahead of time removes a
+good part of the interpreter overhead when loading large files.
+
+The compiled module is a drop-in replacement for the pure-Python one. Cython is not
+a build requirement, so it is only used when it's already installed in the build
+environment (e.g. `pip install --no-build-isolation`). The build falls back to the
+pure-Python module when Cython or a C compiler is not available, or when the
+`HCL2_CYTHON` environment variable is set to `0`.
+"""
+import os
+
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+
+CYTHONIZED_MODULES = ["hcl2/transformer.py"]
+
+
+class OptionalBuildExt(build_ext):
+    """Build C extensions, but do not fail the installation if they can't be built"""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:  # pylint: disable=broad-except
+            self.warn_fallback(exc)
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.warn_fallback(exc)
+
+    def warn_fallback(self, exc: Exception):
+        """Log that the extensions couldn't be built and the pure-Python code is used"""
+        self.warn(
+            f"failed to compile python-hcl2 extensions ({exc}), "
+            "falling back to the pure-Python implementation"
+        )
+
+
+def ext_modules() -> list:
+    """Return the list of Cython extensions to build, empty if they should be skipped"""
+    if os.environ.get("HCL2_CYTHON", "1") == "0":
+        return []
+
+    try:
+        from Cython.Build import cythonize  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return []
+
+    return cythonize(
+        CYTHONIZED_MODULES,
+        compiler_directives={
+            "language_level": 3,
+            "binding": True,
+            # type hints in the module are informative only, e.g. lark tokens are
+            # passed where `str` is annotated, so don't let Cython enforce them
+            "annotation_typing": False,
+        },
+        quiet=True,
+    )
+
+
+setup(ext_modules=ext_modules(), cmdclass={"build_ext": OptionalBuildExt})
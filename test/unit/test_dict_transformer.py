@@ -2,7 +2,9 @@
 
 from unittest import TestCase
 
-from hcl2.transformer import DictTransformer
+from test.helpers.hcl2_helper import Hcl2Helper
+
+from hcl2.transformer import Attribute, DictTransformer
 
 
 class TestDictTransformer(TestCase):
@@ -30,3 +32,45 @@ class TestDictTransformer(TestCase):
             actual = dict_transformer.to_string_dollar(value)
 
             self.assertEqual(actual, expected)
+
+    def test_strip_quotes(self):
+        values = {
+            '"value_1"': "value_1",
+            '"value_\\"2\\""': 'value_"2"',
+            '"value_3': '"value_3',
+            "value_4": "value_4",
+            '""': "",
+            "": "",
+            10: 10,
+        }
+
+        dict_transformer = self.build_dict_transformer()
+
+        for value, expected in values.items():
+            actual = dict_transformer.strip_quotes(value)
+
+            self.assertEqual(actual, expected)
+
+    def test_block_override(self):
+        class CustomBlockTransformer(DictTransformer):
+            """Overrides the `block` rule without asking for meta"""
+
+            def block(self, args):  # pylint: disable=arguments-differ
+                return {"custom": args[-1]}
+
+        tree = Hcl2Helper.load("block {\n}\n")
+        for with_meta in (False, True):
+            result = CustomBlockTransformer(with_meta).transform(tree)
+            self.assertDictEqual(result, {"custom": [{}]})
+
+    def test_attribute(self):
+        attribute = self.build_dict_transformer().attribute(["key", "=", '"value"'])
+
+        self.assertEqual(attribute, Attribute("key", "value"))
+        self.assertEqual(attribute, ("key", "value"))
+        self.assertNotEqual(attribute, Attribute("key", "other"))
+        self.assertEqual(hash(attribute), hash(Attribute("key", "value")))
+        self.assertEqual(repr(attribute), "Attribute(key='key', value='value')")
+
+        key, value = attribute
+        self.assertEqual((key, value), ("key", "value"))
@@ -6,6 +6,7 @@ from unittest import TestCase
 from test.helpers.hcl2_helper import Hcl2Helper
 
 from lark import UnexpectedToken, UnexpectedCharacters
+from lark.exceptions import VisitError
 
 
 class TestHcl2Syntax(Hcl2Helper, TestCase):
@@ -172,3 +173,34 @@ class TestHcl2Syntax(Hcl2Helper, TestCase):
 
         result = self.load_to_dict(identifier)
         self.assertDictEqual(result, expected)
+
+    def test_heredoc(self):
+        heredocs = {
+            "var = <<EOF\n  foo\n    bar\nEOF\n": {"var": "  foo\n    bar"},
+            "var = <<-EOF\n  foo\n    bar\n  EOF\n": {"var": "foo\n  bar"},
+            "var = <<-EOF\n    foo\n\n      bar\n    EOF\n": {"var": "foo\n\n  bar"},
+            "var = <<-EOF\nfoo\n  bar\nEOF\n": {"var": "foo\n  bar"},
+        }
+        for actual, expected in heredocs.items():
+            result = self.load_to_dict(actual)
+            self.assertDictEqual(result, expected)
+
+    def test_body_already_defined(self):
+        bodies = [
+            "var = 1\nvar = 2\n",
+            "var = null\nvar {\n}\n",
+            "var {\n}\nvar = 1\n",
+        ]
+        for body in bodies:
+            with self.assertRaises(VisitError) as e:
+                self.load_to_dict(body)
+            self.assertIsInstance(e.exception.orig_exc, RuntimeError)
+
+    def test_deeply_nested_blocks(self):
+        depth = 1500
+        block = "block {\n" * depth + "attr = 1\n" + "}\n" * depth
+
+        result = self.load_to_dict(block)
+        for _ in range(depth):
+            result = result["block"][0]
+        self.assertDictEqual(result, {"attr": 1})
@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 from unittest import TestCase
 
+from lark.exceptions import VisitError
+
 from hcl2.parser import PARSER_FILE, parser
 import hcl2
 
@@ -55,3 +57,26 @@ class TestLoad(TestCase):
             self.assertDictEqual(
                 hcl2_dict, json_dict, f"failed comparing {hcl_path_str}"
             )
+
+    def test_load_terraform_matches_transform(self):
+        """Test that transforming while parsing gives the same result as transforming the tree"""
+        for hcl_path in HCL2_FILES:
+            yield self.check_transform, hcl_path
+
+    def check_transform(self, hcl_path_str: str):
+        """Compares loading a single hcl2 file with parsing it and transforming the tree"""
+        hcl_path = (HCL2_DIR / hcl_path_str).absolute()
+        text = hcl_path.read_text()
+        self.assertDictEqual(
+            hcl2.loads(text),
+            hcl2.transform(parser().parse(text + "\n")),
+            f"failed comparing {hcl_path_str}",
+        )
+
+    def test_load_errors(self):
+        """Test that errors raised while transforming are reported the same way with and without meta"""
+        for with_meta in (False, True):
+            with self.assertRaises(VisitError) as exc:
+                hcl2.loads("a = 1\na = 2\n", with_meta=with_meta)
+            self.assertEqual(exc.exception.rule, "body")
+            self.assertIsInstance(exc.exception.orig_exc, RuntimeError)